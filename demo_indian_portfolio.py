@@ -46,7 +46,7 @@ sector_max_weights = {
     'Consumer': 0.35
 }
 
-def main():
+def main(plot=True):
     # Initialize optimizer
     optimizer = SectorPortfolioOptimizer(indian_stocks, sectors)
     
@@ -73,8 +73,9 @@ def main():
         print(f"Data exported to: {export_path}")
         
         # Plot results
-        print("\nGenerating portfolio visualization...")
-        optimizer.plot_portfolio_composition(optimal_portfolio)
+        if plot:
+            print("\nGenerating portfolio visualization...")
+            optimizer.plot_portfolio_composition(optimal_portfolio)
         
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -1,10 +1,291 @@
+import os
+import hashlib
 import numpy as np
 import pandas as pd
 import yfinance as yf
-from scipy.optimize import minimize
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.covariance import LedoitWolf
+from scipy import sparse
+from scipy.optimize import minimize, Bounds, BFGS, LinearConstraint
+from sklearn.covariance import ledoit_wolf
+from joblib import Parallel, delayed
+
+try:
+    import cvxpy as cp
+except ImportError:
+    cp = None
+
+try:
+    import cupy
+except ImportError:
+    cupy = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Run the plain Python function when numba is not installed"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'portfolio_optimizer')
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _sharpe_terms(w, mu, cov):
+    """
+    Portfolio return, volatility and Σw in a single pass over cov
+    
+    For a handful of assets an inline loop beats dispatching a BLAS gemv.
+    """
+    n = w.size
+    cov_w = np.empty(n)
+    portfolio_return = 0.0
+    portfolio_var = 0.0
+    for i in range(n):
+        acc = 0.0
+        for j in range(n):
+            acc += cov[i, j] * w[j]
+        cov_w[i] = acc
+        portfolio_return += mu[i] * w[i]
+        portfolio_var += w[i] * acc
+    return portfolio_return, np.sqrt(portfolio_var), cov_w
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _neg_sharpe(w, mu, cov):
+    """
+    Negative Sharpe Ratio for weights w
+    """
+    portfolio_return, portfolio_vol, _ = _sharpe_terms(w, mu, cov)
+    return -portfolio_return / portfolio_vol
+
+
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _neg_sharpe_grad(w, mu, cov):
+    """
+    Gradient of the negative Sharpe Ratio: -μ/σ + (r/σ³)·Σw
+    """
+    portfolio_return, portfolio_vol, cov_w = _sharpe_terms(w, mu, cov)
+    return -mu / portfolio_vol + (portfolio_return / portfolio_vol**3) * cov_w
+
+
+_QP_CACHE = {}
+
+
+def _sharpe_qp_problem(n_assets, sector_matrix=None):
+    """
+    Build (once per asset count and sector matrix) the parametrized Sharpe QP
+    
+    μ, the Cholesky factor of Σ and the sector bounds are cp.Parameters, so
+    cvxpy compiles the problem once and later solves only re-bind values
+    and warm-start OSQP.
+    """
+    key = (n_assets, None if sector_matrix is None else sector_matrix.tobytes())
+    if key not in _QP_CACHE:
+        y = cp.Variable(n_assets, nonneg=True)
+        mu = cp.Parameter(n_assets)
+        chol = cp.Parameter((n_assets, n_assets))
+        kappa = cp.sum(y)
+        constraints = [mu @ y == 1]
+        sector_min = sector_max = None
+        if sector_matrix is not None:
+            sector_min = cp.Parameter(sector_matrix.shape[0])
+            sector_max = cp.Parameter(sector_matrix.shape[0])
+            constraints += [
+                sector_matrix @ y >= cp.multiply(sector_min, kappa),
+                sector_matrix @ y <= cp.multiply(sector_max, kappa)
+            ]
+        prob = cp.Problem(cp.Minimize(cp.sum_squares(chol @ y)), constraints)
+        _QP_CACHE[key] = (prob, y, mu, chol, sector_min, sector_max)
+    return _QP_CACHE[key]
+
+
+def _max_sharpe_qp(mu, cov, sector_matrix=None, sector_min=None, sector_max=None):
+    """
+    Solve the maximum Sharpe portfolio as a convex QP
+    
+    Uses the homogenized form: minimize y'Σy subject to μ'y = 1, y >= 0 and
+    sector bounds scaled by κ = sum(y); the weights are y / κ. Returns None
+    if the problem cannot be solved (e.g. no feasible portfolio has a
+    positive expected return).
+    """
+    try:
+        chol = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        return None
+    
+    prob, y, mu_param, chol_param, min_param, max_param = _sharpe_qp_problem(len(mu), sector_matrix)
+    mu_param.value = mu
+    chol_param.value = chol.T  # y'Σy = ||L'y||² for Σ = LL'
+    if sector_matrix is not None:
+        min_param.value = sector_min
+        max_param.value = sector_max
+    
+    try:
+        prob.solve(solver=cp.OSQP, warm_start=True)
+    except cp.error.SolverError:
+        return None
+    
+    if prob.status not in (cp.OPTIMAL, cp.OPTIMAL_INACCURATE) or y.value is None:
+        return None
+    weights = np.maximum(y.value, 0)
+    return weights / weights.sum()
+
+
+def _ledoit_wolf_gpu(returns):
+    """
+    Ledoit-Wolf shrunk covariance computed with CuPy
+    
+    Same estimator as sklearn.covariance.ledoit_wolf, with the O(n·p²)
+    products on the GPU; worthwhile for universes of hundreds of assets.
+    """
+    X = cupy.asarray(returns, dtype=cupy.float64)
+    n_samples, n_features = X.shape
+    X = X - X.mean(axis=0)
+    
+    X2 = X ** 2
+    emp_cov_trace = X2.sum(axis=0) / n_samples
+    mu = emp_cov_trace.sum() / n_features
+    emp_cov = X.T @ X / n_samples
+    
+    beta_ = (X2.T @ X2).sum()
+    delta_ = (emp_cov ** 2).sum()
+    beta = (beta_ / n_samples - delta_) / (n_features * n_samples)
+    delta = (delta_ - 2.0 * mu * emp_cov_trace.sum() + n_features * mu ** 2) / n_features
+    beta = cupy.minimum(beta, delta)
+    shrinkage = cupy.where(beta == 0, 0.0, beta / delta)
+    
+    shrunk_cov = (1.0 - shrinkage) * emp_cov
+    shrunk_cov[cupy.diag_indices(n_features)] += shrinkage * mu
+    return cupy.asnumpy(shrunk_cov)
+
+
+def _project_simplex(v, z=1.0):
+    """
+    Euclidean projection of v onto {w : w >= 0, sum(w) = z}
+    
+    Sorted-threshold algorithm of Duchi et al. (2008), vectorized over v.
+    """
+    if z <= 0:
+        return np.zeros_like(v)
+    u = -np.sort(-v)
+    cssv = np.cumsum(u) - z
+    rho = np.nonzero(u - cssv / np.arange(1, v.size + 1) > 0)[0][-1]
+    theta = cssv[rho] / (rho + 1)
+    return np.maximum(v - theta, 0)
+
+
+def _project_feasible(v, sector_matrix, sector_min, sector_max, n_iter=60):
+    """
+    Euclidean projection of v onto the simplex with sector weight bounds
+    
+    Sectors partition the stocks, so for a common shift θ each sector block
+    is max(v - θ, 0), or its simplex projection onto the violated sector bound.
+    The total weight is non-increasing in θ, so θ is found by bisection.
+    """
+    members = [np.flatnonzero(row) for row in sector_matrix]
+    
+    def project(theta):
+        w = np.maximum(v - theta, 0)
+        for idx, lo, hi in zip(members, sector_min, sector_max):
+            total = w[idx].sum()
+            if total < lo:
+                w[idx] = _project_simplex(v[idx], lo)
+            elif total > hi:
+                w[idx] = _project_simplex(v[idx], hi)
+        return w
+    
+    theta_lo, theta_hi = v.min() - 1, v.max()
+    for _ in range(n_iter):
+        theta = 0.5 * (theta_lo + theta_hi)
+        if project(theta).sum() > 1:
+            theta_lo = theta
+        else:
+            theta_hi = theta
+    return project(0.5 * (theta_lo + theta_hi))
+
+
+def _slsqp_constraints(n_assets, sector_matrix=None, sector_min=None, sector_max=None):
+    """
+    Build the SLSQP constraint specs with constant Jacobians
+    """
+    ones = np.ones(n_assets)
+    constraints = [
+        {'type': 'eq', 'fun': lambda x: np.sum(x) - 1, 'jac': lambda x: ones}  # weights sum to 1
+    ]
+    
+    # Add sector constraints as two affine vector constraints
+    if sector_matrix is not None:
+        S, lo, hi = sector_matrix, sector_min, sector_max
+        constraints += [
+            {'type': 'ineq', 'fun': lambda x: S @ x - lo, 'jac': lambda x: S},  # minimum sector weights
+            {'type': 'ineq', 'fun': lambda x: hi - S @ x, 'jac': lambda x: -S}  # maximum sector weights
+        ]
+    return constraints
+
+
+def _linear_constraints(n_assets, sector_matrix=None, sector_min=None, sector_max=None):
+    """
+    Build the budget and sector constraints as sparse LinearConstraints
+    
+    For trust-constr, which uses the constant sparse Jacobian directly. SLSQP
+    would convert these back to dense callbacks on every call, so it takes
+    the _slsqp_constraints specs instead.
+    """
+    constraints = [LinearConstraint(sparse.csr_matrix(np.ones((1, n_assets))), 1, 1)]  # weights sum to 1
+    if sector_matrix is not None:
+        constraints.append(LinearConstraint(sparse.csr_matrix(sector_matrix), sector_min, sector_max))
+    return constraints
+
+
+def _max_sharpe_nlp(mu, cov, constraints, init_weights, method='SLSQP'):
+    """
+    Maximize the Sharpe Ratio directly with scipy
+    
+    method is 'SLSQP' or 'trust-constr' (with a BFGS Hessian approximation).
+    Returns None if the solver does not converge.
+    """
+    options = {'hess': BFGS()} if method == 'trust-constr' else {}
+    result = minimize(
+        _neg_sharpe,
+        init_weights,
+        args=(mu, cov),
+        method=method,
+        jac=_neg_sharpe_grad,
+        bounds=Bounds(0, 1),  # individual stock weights in [0, 1]
+        constraints=constraints,
+        **options
+    )
+    return result.x if result.success else None
+
+
+def _fit_window(returns, sector_matrix=None, sector_min=None, sector_max=None):
+    """
+    Estimate inputs and solve for the maximum Sharpe weights on one window
+    
+    A free function so joblib can ship it to worker processes. Returns NaN
+    weights if neither the QP nor SLSQP finds a solution.
+    """
+    cov, _ = ledoit_wolf(returns)
+    mu_ann = returns.mean(axis=0) * 252
+    cov_ann = np.ascontiguousarray(cov * 252)
+    n_assets = len(mu_ann)
+    
+    weights = None
+    if cp is not None:
+        weights = _max_sharpe_qp(mu_ann, cov_ann, sector_matrix, sector_min, sector_max)
+    
+    if weights is None:
+        init_weights = np.full(n_assets, 1 / n_assets)
+        if sector_matrix is not None:
+            init_weights = _project_feasible(init_weights, sector_matrix, sector_min, sector_max)
+        constraints = _slsqp_constraints(n_assets, sector_matrix, sector_min, sector_max)
+        weights = _max_sharpe_nlp(mu_ann, cov_ann, constraints, init_weights)
+    
+    if weights is None:
+        weights = np.full(n_assets, np.nan)
+    return weights
+
 
 class SectorPortfolioOptimizer:
     def __init__(self, stocks_data, sectors):
@@ -21,30 +302,107 @@ class SectorPortfolioOptimizer:
         self.returns = None
         self.cov_matrix = None
         self.sector_constraints = None
+        self._returns_np = None
+        self._mu_ann = None
+        self._cov_ann = None
+        self._sector_min = None
+        self._sector_max = None
+        self._last_weights = None
+        
+        # Sector indicator matrix (sectors x stocks), so sector weights are S @ w
+        self._sector_idx = {sector: i for i, sector in enumerate(self.sectors)}
+        self._S = np.zeros((len(self.sectors), len(self.stocks)))
+        for j, stock in enumerate(self.stocks):
+            self._S[self._sector_idx[self.stock_sectors[stock]], j] = 1.0
+        
+        # SLSQP constraint specs, rebuilt only when the sector constraints change
+        self._constraints = self._build_constraints()
         
-    def fetch_data(self, start_date, end_date):
+    def fetch_data(self, start_date, end_date, use_cache=True, cache_dir=DEFAULT_CACHE_DIR,
+                   log_returns=False, use_gpu=False):
         """
         Fetch historical data for the stocks using yfinance
+        
+        Prices and the Ledoit-Wolf covariance are cached on disk, keyed by
+        the tickers and the start/end dates, so repeated runs skip the network.
+        
+        Parameters:
+        start_date, end_date: Date range to fetch (only the date part is used for the cache key)
+        use_cache (bool): Read from and write to the on-disk cache
+        cache_dir (str): Directory holding the cached prices and covariance
+        log_returns (bool): Use daily log returns instead of simple returns
+        use_gpu (bool): Estimate the Ledoit-Wolf covariance on the GPU with CuPy when available
         """
-        data = pd.DataFrame()
-        for stock in self.stocks:
-            try:
-                ticker = yf.Ticker(stock)
-                hist = ticker.history(start=start_date, end=end_date)['Close']
-                data[stock] = hist
-            except Exception as e:
-                print(f"Error fetching data for {stock}: {e}")
+        prices_path = cov_path = None
+        if use_cache:
+            key = hashlib.sha1(repr((
+                list(self.stocks),
+                pd.Timestamp(start_date).date().isoformat(),
+                pd.Timestamp(end_date).date().isoformat()
+            )).encode()).hexdigest()
+            os.makedirs(cache_dir, exist_ok=True)
+            prices_path = os.path.join(cache_dir, f'{key}_prices.parquet')
+            cov_path = os.path.join(cache_dir, f'{key}_cov{"_log" if log_returns else ""}.npy')
+        
+        if prices_path and os.path.exists(prices_path):
+            data = pd.read_parquet(prices_path)
+        else:
+            data = self._download_prices(start_date, end_date)
+            missing = data.columns[data.isna().all()]
+            for stock in missing:
+                print(f"Error fetching data for {stock}: no price history returned")
+            # Only cache complete downloads so failed tickers are retried
+            if prices_path and len(missing) == 0:
+                data.to_parquet(prices_path)
         
-        # Calculate daily returns
-        self.returns = data.pct_change().dropna()
+        # Calculate daily returns; keep the DataFrame for export and the array for math
+        prices = data.ffill().to_numpy(dtype=np.float64)
+        if log_returns:
+            log_prices = np.log(prices)
+            returns = log_prices[1:] - log_prices[:-1]
+        else:
+            returns = prices[1:] / prices[:-1] - 1.0
+        valid = ~np.isnan(returns).any(axis=1)
+        self._returns_np = returns[valid]
+        self.returns = pd.DataFrame(self._returns_np, index=data.index[1:][valid], columns=data.columns)
         
         # Calculate covariance matrix using Ledoit-Wolf shrinkage
-        lw = LedoitWolf()
-        self.cov_matrix = pd.DataFrame(
-            lw.fit(self.returns).covariance_,
-            index=self.returns.columns,
-            columns=self.returns.columns
-        )
+        if cov_path and os.path.exists(cov_path):
+            cov = np.load(cov_path)
+        else:
+            if use_gpu and cupy is not None:
+                cov = _ledoit_wolf_gpu(self._returns_np)
+            else:
+                if use_gpu:
+                    print("CuPy is not available, estimating the covariance on the CPU")
+                cov, _ = ledoit_wolf(self._returns_np)
+            if cov_path and os.path.exists(prices_path):
+                np.save(cov_path, cov)
+        
+        # Cache annualized inputs for the optimizer as plain arrays
+        self._mu_ann = self._returns_np.mean(axis=0) * 252
+        self._cov_ann = np.ascontiguousarray(cov * 252)
+        
+        # DataFrame view for display and export only
+        self.cov_matrix = pd.DataFrame(cov, index=self.returns.columns, columns=self.returns.columns)
+    
+    def _download_prices(self, start_date, end_date):
+        """
+        Download adjusted closes for all stocks in a single threaded request
+        """
+        data = yf.download(
+            list(self.stocks),
+            start=start_date,
+            end=end_date,
+            auto_adjust=True,
+            ignore_tz=False,  # keep exchange-local (Asia/Kolkata) dates like Ticker.history
+            threads=True,
+            group_by='column',
+            progress=False
+        )['Close']
+        if isinstance(data, pd.Series):
+            data = data.to_frame(self.stocks[0])
+        return data.reindex(columns=self.stocks).dropna(how='all')
         
     def set_sector_constraints(self, min_weights, max_weights):
         """
@@ -53,103 +411,239 @@ class SectorPortfolioOptimizer:
         Parameters:
         min_weights (dict): Minimum weights for each sector
         max_weights (dict): Maximum weights for each sector
+        
+        Raises ValueError if a sector's minimum exceeds its maximum or if no
+        fully invested portfolio can meet the bounds (sum of minimums above 1
+        or sum of maximums below 1).
         """
+        sector_min = np.array([min_weights[sector] for sector in self.sectors], dtype=np.float64)
+        sector_max = np.array([max_weights[sector] for sector in self.sectors], dtype=np.float64)
+        for sector, lo, hi in zip(self.sectors, sector_min, sector_max):
+            if lo > hi:
+                raise ValueError(f"Minimum weight {lo} exceeds maximum weight {hi} for sector {sector}")
+        if sector_min.sum() > 1:
+            raise ValueError(f"Sector minimum weights sum to {sector_min.sum():.4f}, more than 1")
+        if sector_max.sum() < 1:
+            raise ValueError(f"Sector maximum weights sum to {sector_max.sum():.4f}, less than 1")
+        
         self.sector_constraints = {
             'min': min_weights,
             'max': max_weights
         }
+        self._sector_min = sector_min
+        self._sector_max = sector_max
+        self._constraints = self._build_constraints()
+        self._last_weights = None
+    
+    def _build_constraints(self):
+        """
+        Build the SLSQP constraint specs for the current sector constraints
+        """
+        if self.sector_constraints:
+            return _slsqp_constraints(len(self.stocks), self._S, self._sector_min, self._sector_max)
+        return _slsqp_constraints(len(self.stocks))
     
     def _get_portfolio_stats(self, weights):
         """
         Calculate portfolio statistics (returns and volatility)
         """
-        portfolio_return = np.sum(self.returns.mean() * weights) * 252
-        portfolio_vol = np.sqrt(np.dot(weights.T, np.dot(self.cov_matrix * 252, weights)))
+        portfolio_return, portfolio_vol, _ = _sharpe_terms(weights, self._mu_ann, self._cov_ann)
         return portfolio_return, portfolio_vol
     
     def _objective_function(self, weights):
         """
         Objective function to minimize (negative Sharpe Ratio)
         """
-        portfolio_return, portfolio_vol = self._get_portfolio_stats(weights)
-        sharpe_ratio = portfolio_return / portfolio_vol
-        return -sharpe_ratio
+        return _neg_sharpe(weights, self._mu_ann, self._cov_ann)
     
-    def _get_sector_weights(self, weights):
+    def _objective_grad(self, weights):
         """
-        Calculate total weights for each sector
+        Analytic gradient of the negative Sharpe Ratio
         """
-        sector_weights = {sector: 0 for sector in self.sectors}
-        for stock, weight in zip(self.stocks, weights):
-            sector = self.stock_sectors[stock]
-            sector_weights[sector] += weight
-        return sector_weights
+        return _neg_sharpe_grad(weights, self._mu_ann, self._cov_ann)
     
-    def optimize_portfolio(self):
+    def optimize_portfolio(self, nlp_method='SLSQP', warm_start='project'):
         """
         Optimize the portfolio using sector constraints
+        
+        The maximum Sharpe portfolio is solved as a convex QP when cvxpy is
+        available, with scipy as the fallback. The result holds the weights
+        both as dicts for display and as ndarrays ('weights_arr' in
+        self.stocks order, 'sector_weights_arr' in self.sectors order).
+        
+        Parameters:
+        nlp_method (str): scipy method for the fallback, 'SLSQP' or 'trust-constr'
+        warm_start (str): Cold start for the fallback, 'project' (equal weights projected
+            onto the constraints) or 'monte_carlo' (best of random feasible portfolios)
+        """
+        optimal_weights = None
+        if cp is not None:
+            if self.sector_constraints:
+                optimal_weights = _max_sharpe_qp(
+                    self._mu_ann, self._cov_ann, self._S, self._sector_min, self._sector_max
+                )
+            else:
+                optimal_weights = _max_sharpe_qp(self._mu_ann, self._cov_ann)
+        
+        if optimal_weights is None:
+            optimal_weights = self._optimize_nlp(nlp_method, warm_start)
+        self._last_weights = optimal_weights
+        
+        portfolio_return, portfolio_vol = self._get_portfolio_stats(optimal_weights)
+        sharpe_ratio = portfolio_return / portfolio_vol
+        
+        sector_weights = self._S @ optimal_weights
+        
+        return {
+            'weights': dict(zip(self.stocks, optimal_weights)),
+            'sector_weights': dict(zip(self.sectors, sector_weights)),
+            'weights_arr': optimal_weights,
+            'sector_weights_arr': sector_weights,
+            'portfolio_return': portfolio_return,
+            'portfolio_volatility': portfolio_vol,
+            'sharpe_ratio': sharpe_ratio
+        }
+    
+    def _optimize_nlp(self, method='SLSQP', warm_start='project'):
+        """
+        Maximize the Sharpe Ratio directly with a scipy solver
+        """
+        # Initial weights: warm start from the previous optimum when there is one
+        init_weights = self._last_weights
+        if init_weights is None and warm_start == 'monte_carlo':
+            init_weights = self._monte_carlo_warmstart()
+        if init_weights is None:
+            init_weights = self._feasible_start()
+        
+        if method == 'trust-constr':
+            sector_args = (self._S, self._sector_min, self._sector_max) if self.sector_constraints else ()
+            constraints = _linear_constraints(len(self.stocks), *sector_args)
+        else:
+            constraints = self._constraints
+        
+        weights = _max_sharpe_nlp(self._mu_ann, self._cov_ann, constraints, init_weights, method)
+        if weights is None:
+            return self._optimize_projected_gradient(init_weights)
+        return weights
+    
+    def optimize_rolling(self, dates, window=252, n_jobs=-1):
+        """
+        Re-optimize the portfolio on a rolling lookback window
+        
+        Each window is estimated and solved independently, so the windows
+        run in parallel with joblib.
+        
+        Parameters:
+        dates (list): Rebalance dates; each window ends at the last return on or before the date
+        window (int): Number of daily returns in each lookback window
+        n_jobs (int): Number of parallel workers (-1 uses all cores)
+        
+        Returns:
+        pd.DataFrame: Optimal weights, one row per rebalance date and one column per stock
+        """
+        dates = pd.DatetimeIndex(dates)
+        index = self.returns.index
+        if index.tz is not None and dates.tz is None:
+            dates = dates.tz_localize(index.tz)
+        
+        ends = index.searchsorted(dates, side='right')
+        short = ends < window
+        if short.any():
+            raise ValueError(f"Not enough history for a {window}-day window ending {dates[short][0].date()}")
+        
+        sector_args = (self._S, self._sector_min, self._sector_max) if self.sector_constraints else ()
+        weights = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_fit_window)(self._returns_np[end - window:end], *sector_args) for end in ends
+        )
+        return pd.DataFrame(np.array(weights), index=dates, columns=self.stocks)
+    
+    def _monte_carlo_warmstart(self, n_samples=10000):
+        """
+        Best Sharpe portfolio among random samples that satisfy the sector bounds
+        
+        Draws Dirichlet weights with a fixed seed (so the start is reproducible),
+        rejects infeasible rows and scores the rest in one vectorized pass.
+        Returns None if no sample is feasible.
         """
         n_assets = len(self.stocks)
+        W = np.random.default_rng(0).dirichlet(np.ones(n_assets), size=n_samples)
         
-        # Initial weights
-        init_weights = np.array([1/n_assets] * n_assets)
+        if self.sector_constraints:
+            sector_weights = W @ self._S.T
+            feasible = ((sector_weights >= self._sector_min).all(axis=1)
+                        & (sector_weights <= self._sector_max).all(axis=1))
+            W = W[feasible]
+            if len(W) == 0:
+                return None
         
-        # Constraints
-        constraints = [
-            {'type': 'eq', 'fun': lambda x: np.sum(x) - 1}  # weights sum to 1
-        ]
+        portfolio_returns = W @ self._mu_ann
+        portfolio_vols = np.sqrt(np.einsum('ij,ij->i', W @ self._cov_ann, W))
+        return W[np.argmax(portfolio_returns / portfolio_vols)]
+    
+    def _feasible_start(self):
+        """
+        Project the equal-weight portfolio onto the constraint set
         
-        # Add sector constraints
+        Equal weights can violate the sector bounds; starting from the
+        nearest feasible point saves the solver its feasibility iterations.
+        """
+        n_assets = len(self.stocks)
+        return self._project(np.full(n_assets, 1 / n_assets))
+    
+    def _project(self, weights):
+        """
+        Euclidean projection onto the feasible weights
+        """
         if self.sector_constraints:
-            for sector in self.sectors:
-                sector_stocks_idx = [i for i, stock in enumerate(self.stocks)
-                                   if self.stock_sectors[stock] == sector]
-                
-                # Minimum sector weight constraint
-                constraints.append({
-                    'type': 'ineq',
-                    'fun': lambda x, idx=sector_stocks_idx:
-                        np.sum(x[idx]) - self.sector_constraints['min'][sector]
-                })
-                
-                # Maximum sector weight constraint
-                constraints.append({
-                    'type': 'ineq',
-                    'fun': lambda x, idx=sector_stocks_idx:
-                        self.sector_constraints['max'][sector] - np.sum(x[idx])
-                })
-        
-        # Individual stock constraints (non-negative weights)
-        bounds = tuple((0, 1) for _ in range(n_assets))
-        
-        # Optimize
-        result = minimize(
-            self._objective_function,
-            init_weights,
-            method='SLSQP',
-            bounds=bounds,
-            constraints=constraints
-        )
+            return _project_feasible(weights, self._S, self._sector_min, self._sector_max)
+        return _project_simplex(weights)
+    
+    def _optimize_projected_gradient(self, init_weights, max_iter=1000, tol=1e-12, feas_tol=1e-6):
+        """
+        Projected gradient descent on the negative Sharpe Ratio
         
-        if result.success:
-            optimal_weights = result.x
-            portfolio_return, portfolio_vol = self._get_portfolio_stats(optimal_weights)
-            sharpe_ratio = portfolio_return / portfolio_vol
+        Used as a safety net when the scipy solver fails. Raises if the
+        result breaks the budget or sector constraints by more than feas_tol.
+        """
+        weights = self._project(init_weights)
+        objective = self._objective_function(weights)
+        step = 1.0
+        for _ in range(max_iter):
+            grad = self._objective_grad(weights)
             
-            return {
-                'weights': dict(zip(self.stocks, optimal_weights)),
-                'sector_weights': self._get_sector_weights(optimal_weights),
-                'portfolio_return': portfolio_return,
-                'portfolio_volatility': portfolio_vol,
-                'sharpe_ratio': sharpe_ratio
-            }
-        else:
+            # Backtrack until the quadratic upper bound holds along the projection
+            while True:
+                candidate = self._project(weights - step * grad)
+                delta = candidate - weights
+                candidate_objective = self._objective_function(candidate)
+                if candidate_objective <= objective + grad @ delta + delta @ delta / (2 * step) or step < 1e-12:
+                    break
+                step *= 0.5
+            
+            converged = objective - candidate_objective < tol
+            weights, objective = candidate, candidate_objective
+            if converged:
+                break
+            step *= 2
+        
+        infeasible = abs(weights.sum() - 1) > feas_tol or weights.min() < -feas_tol
+        if self.sector_constraints:
+            sector_weights = self._S @ weights
+            infeasible = (infeasible
+                          or (sector_weights < self._sector_min - feas_tol).any()
+                          or (sector_weights > self._sector_max + feas_tol).any())
+        if infeasible:
             raise Exception("Optimization failed to converge")
+        return weights
     
     def plot_portfolio_composition(self, optimal_weights):
         """
         Create visualizations for portfolio composition
         """
+        # Imported lazily so scripted runs without plots skip the import cost
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         # Set style
         plt.style.use('seaborn-v0_8')  # Use a valid style name
         
@@ -157,13 +651,13 @@ class SectorPortfolioOptimizer:
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
         
         # Plot 1: Stock Weights
-        stock_weights = pd.Series(optimal_weights['weights'])
+        stock_weights = pd.Series(optimal_weights['weights_arr'], index=self.stocks)
         stock_weights.sort_values(ascending=True).plot(kind='barh', ax=ax1)
         ax1.set_title('Individual Stock Weights')
         ax1.set_xlabel('Weight')
         
         # Plot 2: Sector Weights
-        sector_weights = pd.Series(optimal_weights['sector_weights'])
+        sector_weights = pd.Series(optimal_weights['sector_weights_arr'], index=self.sectors)
         sector_weights.plot(kind='pie', autopct='%1.1f%%', ax=ax2)
         ax2.set_title('Sector Allocation')
         
@@ -176,29 +670,40 @@ class SectorPortfolioOptimizer:
         print(f"Annual Volatility: {optimal_weights['portfolio_volatility']*100:.2f}%")
         print(f"Sharpe Ratio: {optimal_weights['sharpe_ratio']:.2f}")
     
-    def export_data_for_visualization(self, optimal_weights, output_dir='./data_exports'):
-        """Export portfolio data for Tableau/Power BI visualization"""
-        import os
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            
+    def export_data_for_visualization(self, optimal_weights, output_dir='./data_exports', file_format='csv'):
+        """Export portfolio data for Tableau/Power BI visualization
+        
+        file_format is 'csv' (readable by Tableau) or 'parquet' (faster to
+        write and keeps dtypes, readable by Power BI).
+        """
+        if file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported file format: {file_format}")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        def write(df, name, index=False):
+            path = f'{output_dir}/{name}.{file_format}'
+            if file_format == 'parquet':
+                df.to_parquet(path, index=index)
+            else:
+                df.to_csv(path, index=index)
+        
         # Export stock weights
         stock_weights_df = pd.DataFrame({
-            'Stock': list(optimal_weights['weights'].keys()),
-            'Weight': list(optimal_weights['weights'].values()),
-            'Sector': [self.stock_sectors[stock] for stock in optimal_weights['weights'].keys()]
+            'Stock': np.array(self.stocks),
+            'Weight': optimal_weights['weights_arr'],
+            'Sector': np.array([self.stock_sectors[stock] for stock in self.stocks])
         })
-        stock_weights_df.to_csv(f'{output_dir}/stock_weights.csv', index=False)
+        write(stock_weights_df, 'stock_weights')
         
         # Export sector weights
         sector_weights_df = pd.DataFrame({
-            'Sector': list(optimal_weights['sector_weights'].keys()),
-            'Weight': list(optimal_weights['sector_weights'].values())
+            'Sector': np.array(self.sectors),
+            'Weight': optimal_weights['sector_weights_arr']
         })
-        sector_weights_df.to_csv(f'{output_dir}/sector_weights.csv', index=False)
+        write(sector_weights_df, 'sector_weights')
         
         # Export historical returns
-        self.returns.to_csv(f'{output_dir}/historical_returns.csv')
+        write(self.returns, 'historical_returns', index=True)
         
         # Export portfolio performance metrics
         performance_df = pd.DataFrame({
@@ -209,6 +714,6 @@ class SectorPortfolioOptimizer:
                 optimal_weights['sharpe_ratio']
             ]
         })
-        performance_df.to_csv(f'{output_dir}/portfolio_metrics.csv', index=False)
+        write(performance_df, 'portfolio_metrics')
         
         return output_dir
\ No newline at end of file